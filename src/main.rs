@@ -1,4 +1,5 @@
 use axum::extract::{Json, State};
+use axum::http::StatusCode;
 use axum::routing::post;
 use axum::Router;
 use sage_core::database::IndexedDatabase;
@@ -30,12 +31,9 @@ pub struct AnnotatedFeature {
     feature: Feature,
 }
 
-async fn score_v1(
-    State(db): State<Arc<IndexedDatabase>>,
-    Json(query): Json<ScoreRequest>,
-) -> Result<Json<Vec<AnnotatedFeature>>, (axum::http::StatusCode, String)> {
+fn score(db: &IndexedDatabase, query: ScoreRequest) -> Vec<AnnotatedFeature> {
     let scorer = Scorer {
-        db: &db,
+        db,
         precursor_tol: query.precursor_tolerance,
         fragment_tol: query.fragment_tolerance,
         min_matched_peaks: 4,
@@ -70,10 +68,9 @@ async fn score_v1(
         intensity: query.intensity,
     };
 
-    let spectra =
-        SpectrumProcessor::new(150, 0.0, 2000.0, query.deisotope).process(spectra.clone());
+    let spectra = SpectrumProcessor::new(150, 0.0, 2000.0, query.deisotope).process(spectra);
 
-    let scores = scorer
+    scorer
         .score(&spectra)
         .into_iter()
         .map(|feature| AnnotatedFeature {
@@ -81,7 +78,34 @@ async fn score_v1(
             proteins: db[feature.peptide_idx].proteins(&db.decoy_tag, db.generate_decoys),
             feature,
         })
-        .collect();
+        .collect()
+}
+
+async fn score_v1(
+    State(db): State<Arc<IndexedDatabase>>,
+    Json(query): Json<ScoreRequest>,
+) -> Result<Json<Vec<AnnotatedFeature>>, (StatusCode, String)> {
+    // Scoring is CPU-bound - run it on the blocking pool so that concurrent
+    // requests don't stall the async workers
+    let scores = tokio::task::spawn_blocking(move || score(&db, query))
+        .await
+        .map_err(|e| (StatusCode::INTERNAL_SERVER_ERROR, e.to_string()))?;
+
+    Ok(Json(scores))
+}
+
+async fn score_batch_v1(
+    State(db): State<Arc<IndexedDatabase>>,
+    Json(queries): Json<Vec<ScoreRequest>>,
+) -> Result<Json<Vec<Vec<AnnotatedFeature>>>, (StatusCode, String)> {
+    let scores = tokio::task::spawn_blocking(move || {
+        queries
+            .into_iter()
+            .map(|query| score(&db, query))
+            .collect::<Vec<_>>()
+    })
+    .await
+    .map_err(|e| (StatusCode::INTERNAL_SERVER_ERROR, e.to_string()))?;
 
     Ok(Json(scores))
 }
@@ -108,6 +132,7 @@ async fn main() -> Result<(), Error> {
 
     let app = Router::new()
         .route("/v1/score/", post(score_v1))
+        .route("/v1/score/batch/", post(score_batch_v1))
         .with_state(Arc::new(db))
         .layer(CorsLayer::very_permissive())
         .layer(CompressionLayer::new().gzip(true).deflate(true));
@@ -115,6 +140,7 @@ async fn main() -> Result<(), Error> {
     let addr = std::net::SocketAddr::from(([127, 0, 0, 1], 3000));
 
     axum::Server::bind(&addr)
+        .tcp_nodelay(true)
         .serve(app.into_make_service())
         .await
         .unwrap();